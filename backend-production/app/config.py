@@ -1,45 +1,134 @@
 import os
-from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import FrozenSet, Optional
 
-# Load environment variables
-load_dotenv()
+# backend-production/.env, independent of the working directory
+DEFAULT_ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
+
+# Whitespace followed by "#" starts an inline comment in an unquoted value
+_INLINE_COMMENT = re.compile(r"\s+#")
+
+
+def load_env_file(path: Optional[Path] = None) -> None:
+    """
+    Load KEY=VALUE pairs from a .env file into os.environ.
+
+    Variables already set in the environment take precedence, matching
+    python-dotenv's default behaviour. Quoted values are taken verbatim;
+    unquoted values have any trailing " # comment" removed.
+    """
+    if path is None:
+        path = DEFAULT_ENV_PATH
+    try:
+        with open(path, "rb") as f:
+            content = f.read().decode("utf-8")
+    except FileNotFoundError:
+        return
+
+    for line in content.split("\n"):
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        key = key.strip()
+        if key.startswith("export "):
+            key = key[7:].strip()
+        value = value.strip()
+        if value[:1] in ("'", '"'):
+            closing = value.find(value[0], 1)
+            if closing != -1:
+                value = value[1:closing]
+        else:
+            value = _INLINE_COMMENT.split(value, 1)[0]
+        os.environ.setdefault(key, value)
 
 
 class Settings:
     """Application settings and configuration"""
-    
-    # API Keys
-    
-    class Config:
-        env_file = ".env"
-
-    GOOGLE_PLACES_API_KEY: str = os.getenv("GOOGLE_PLACES_API_KEY", "")
-    GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
-    BASE_URL: str = os.getenv("BASE_URL", "http://localhost:8000")
-    
-    # API Configuration
-    # IMPORTANT: Add your production frontend URL here for CORS
-    # Example: "http://your-frontend-s3-bucket.s3-website-us-east-1.amazonaws.com,http://yourdomain.com"
-    # For development, include localhost. For production, include your actual frontend domain.
-    CORS_ORIGINS: list = os.getenv("CORS_ORIGINS", "http://localhost:4200,http://localhost:3000,https://parlor-mu.vercel.app").split(",")
-
-    # Environment
-    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
-    
+
     # Google Places API Configuration
     GOOGLE_PLACES_SEARCH_RADIUS: int = 50000  # meters (about 31 miles)
-    
+
     # Recommendation Settings
     MAX_RECOMMENDATIONS: int = 3
-    
-    @classmethod
-    def validate(cls):
+
+    # Session Cache Settings
+    SESSION_CACHE_MAX_SIZE: int = 10000
+    SESSION_CACHE_TTL_SECONDS: int = 1800  # 30 minutes of inactivity
+
+    # Summary Cache Settings
+    SUMMARY_CACHE_MAX_SIZE: int = 5000
+    SUMMARY_CACHE_TTL_SECONDS: int = 3600  # 1 hour
+    SUMMARY_ADMISSION_WINDOW_SECONDS: int = 600  # 2nd request within 10 minutes
+
+    # Google Places Cache Settings
+    PLACES_CACHE_MAX_SIZE: int = 10000
+    GEOCODE_CACHE_TTL_SECONDS: int = 86400  # 24 hours
+    SEARCH_CACHE_TTL_SECONDS: int = 1800  # 30 minutes
+    PLACES_DETAILS_CONCURRENCY: int = 16  # max parallel Place Details requests
+
+    # Google Places Rate Limiting
+    PLACES_RATE_LIMIT_PER_MINUTE: int = 500
+    PLACES_MAX_ATTEMPTS: int = 3  # total, across 429 and transport error retries
+    PLACES_RETRY_BUDGET_SECONDS: float = 10.0  # no retry starts after this
+
+    # Autocomplete Circuit Breaker Settings
+    AUTOCOMPLETE_BREAKER_THRESHOLD: int = 3  # consecutive 5xx responses
+    AUTOCOMPLETE_BREAKER_WINDOW_SECONDS: float = 30.0
+    AUTOCOMPLETE_BREAKER_COOLDOWN_SECONDS: float = 30.0
+
+    # Session Store Settings
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5  # connect and per-command
+
+    # Logging Settings
+    SLOW_REQUEST_THRESHOLD_MS: int = 200
+
+    def __init__(self):
+        env = os.environ
+
+        # API Keys
+        self.GOOGLE_PLACES_API_KEY: str = env.get("GOOGLE_PLACES_API_KEY", "")
+        self.GEMINI_API_KEY: str = env.get("GEMINI_API_KEY", "")
+        self.BASE_URL: str = env.get("BASE_URL", "http://localhost:8000")
+
+        # API Configuration
+        # IMPORTANT: Add your production frontend URL here for CORS
+        # Example: "http://your-frontend-s3-bucket.s3-website-us-east-1.amazonaws.com,http://yourdomain.com"
+        # For development, include localhost. For production, include your actual frontend domain.
+        self.CORS_ORIGINS: FrozenSet[str] = frozenset(
+            origin.strip()
+            for origin in env.get("CORS_ORIGINS", "http://localhost:4200,http://localhost:3000,https://parlor-mu.vercel.app").split(",")
+            if origin.strip()
+        )
+
+        # Environment
+        self.ENVIRONMENT: str = env.get("ENVIRONMENT", "development")
+
+        # Session Store
+        # Set to share sessions across workers, e.g. "redis://localhost:6379/0".
+        # Leave empty to keep sessions in process memory.
+        self.REDIS_URL: str = env.get("REDIS_URL", "")
+
+        # Server
+        # Number of uvicorn worker processes. Use more than 1 together with
+        # REDIS_URL so sessions are shared between workers.
+        self.WORKERS: int = int(env.get("WEB_CONCURRENCY", "1"))
+
+    def validate(self):
         """Validate that required settings are present"""
-        if not cls.GOOGLE_PLACES_API_KEY:
+        if not self.GOOGLE_PLACES_API_KEY:
             raise ValueError("GOOGLE_PLACES_API_KEY is required")
-        if not cls.GEMINI_API_KEY:
+        if not self.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY is required")
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load the .env file and build the Settings instance once per process"""
+    load_env_file()
+    return Settings()
+
+
+settings = get_settings()
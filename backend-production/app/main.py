@@ -5,13 +5,20 @@ This module provides the FastAPI application for pizza restaurant
 recommendations using Google Places API and Gemini AI.
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict
+from contextlib import asynccontextmanager
+from starlette.background import BackgroundTask
+from cachetools import TTLCache
+from typing import List, Dict, Optional, Set, Tuple
+import asyncio
+import heapq
 import logging
+import threading
+import time
 import uuid
-import hashlib
 import random
+import orjson
 
 from app.config import settings
 from app.models import (
@@ -20,20 +27,56 @@ from app.models import (
     GeocodeRequest,
     GeocodeResponse,
     AIGeneratedSummary,
-    RecommendationsResponse
+    PIZZA_CUISINE
 )
 from app.services.google_places import get_google_places_service
 from app.services.gemini import get_gemini_service
-import requests
-from fastapi.responses import StreamingResponse
+from app.services.http_client import init_http_client, get_http_client, close_http_client
+from app.services.session_store import get_session_store, build_windows
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# In-memory session cache for ranked restaurants
-# Format: {session_id: {"restaurants": List[Restaurant], "search_params": dict}}
-session_cache: Dict[str, Dict] = {}
+# Session cache hit/miss counters for this worker (sessions live in the session store)
+session_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+# AI summaries keyed by restaurant ID. A summary is only admitted once the same
+# restaurant has been requested twice within the admission window, so one-off
+# clickthroughs don't push out summaries that are actually reopened.
+summary_cache: TTLCache = TTLCache(
+    maxsize=settings.SUMMARY_CACHE_MAX_SIZE,
+    ttl=settings.SUMMARY_CACHE_TTL_SECONDS
+)
+summary_request_counts: TTLCache = TTLCache(
+    maxsize=settings.SUMMARY_CACHE_MAX_SIZE,
+    ttl=settings.SUMMARY_ADMISSION_WINDOW_SECONDS
+)
+summary_cache_lock = threading.Lock()
+
+# Caps concurrent batched Gemini calls made by background summary prewarming
+_prewarm_semaphore = asyncio.Semaphore(3)
+# Strong references to in-flight background tasks so they aren't garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the shared outbound HTTP client and session store on startup and
+    close them on shutdown, after cancelling any summary prewarm tasks so
+    none of them are still using the client or store once it is closed.
+    """
+    init_http_client()
+    session_store = get_session_store()
+    yield
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    await session_store.close()
+    await close_http_client()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -41,7 +84,9 @@ app = FastAPI(
     description="Backend API for AI-powered pizza restaurant recommendations",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -49,11 +94,67 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=("GET", "POST", "OPTIONS"),
+    allow_headers=("content-type", "authorization"),
 )
 
 
+class SlowRequestLogMiddleware:
+    """
+    Log requests slower than SLOW_REQUEST_THRESHOLD_MS as a single JSON line.
+    
+    Replaces uvicorn's per-request access log, so fast requests cost nothing
+    beyond a timer. Written as plain ASGI rather than with @app.middleware,
+    which would add a task and memory stream to every request, including
+    streamed photos. The duration runs from the request arriving until the
+    last chunk of the response body is sent, or until the request fails.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status_code = 500
+        logged = False
+        
+        def log_if_slow():
+            nonlocal logged
+            logged = True
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if elapsed_ms > settings.SLOW_REQUEST_THRESHOLD_MS:
+                logger.warning(orjson.dumps({
+                    "event": "slow_request",
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(elapsed_ms, 1)
+                }).decode())
+        
+        async def send_and_time(message):
+            nonlocal status_code
+            await send(message)
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                log_if_slow()
+        
+        try:
+            await self.app(scope, receive, send_and_time)
+        finally:
+            # Requests that raise never send a final body chunk; log them with
+            # the status sent so far (500 if the response never started)
+            if not logged:
+                log_if_slow()
+
+
+app.add_middleware(SlowRequestLogMiddleware)
+
+
 @app.get("/")
 async def root():
     """
@@ -69,10 +170,20 @@ async def root():
     }
 
 
+# Headers passed between the browser and Google so photo revalidation works
+_CONDITIONAL_REQUEST_HEADERS = ("if-none-match", "if-modified-since")
+_CACHE_RESPONSE_HEADERS = ("etag", "last-modified", "cache-control", "expires")
+
+
 @app.get("/api/media/{resource_name:path}")
-def get_photo_proxy(resource_name: str):
+async def get_photo_proxy(resource_name: str, request: Request):
     """
     Proxy Google Places photos to avoid exposing API key on frontend.
+    
+    Photos are streamed through the shared async HTTP client, so concurrent
+    image loads don't each hold a threadpool worker. The browser's
+    conditional headers are forwarded and the upstream validators returned,
+    so revalidating a cached photo costs a 304 instead of the image.
     """
     if not resource_name:
          raise HTTPException(status_code=404, detail="Resource name required")
@@ -88,17 +199,44 @@ def get_photo_proxy(resource_name: str):
             "maxWidthPx": 400
         }
         
-        # Stream the response
-        external_req = requests.get(url, params=params, stream=True, timeout=10)
+        # Stream the response - the upstream response is closed once the
+        # StreamingResponse has finished sending, not when this handler returns
+        conditional_headers = {
+            name: request.headers[name]
+            for name in _CONDITIONAL_REQUEST_HEADERS
+            if name in request.headers
+        }
+        
+        client = get_http_client()
+        external_req = await client.send(
+            client.build_request("GET", url, params=params, headers=conditional_headers),
+            stream=True,
+            follow_redirects=True
+        )
+        validator_headers = {
+            name: external_req.headers[name]
+            for name in _CACHE_RESPONSE_HEADERS
+            if name in external_req.headers
+        }
+        
+        if external_req.status_code == 304:
+            await external_req.aclose()
+            return Response(status_code=304, headers=validator_headers)
         
         if external_req.status_code != 200:
+             await external_req.aread()
+             await external_req.aclose()
              logger.error(f"Error fetching photo: {external_req.status_code} {external_req.text}")
              raise HTTPException(status_code=404, detail="Photo not found")
 
         return StreamingResponse(
-            external_req.iter_content(chunk_size=8192), 
-            media_type=external_req.headers.get("content-type", "image/jpeg")
+            external_req.aiter_bytes(8192),
+            media_type=external_req.headers.get("content-type", "image/jpeg"),
+            headers=validator_headers,
+            background=BackgroundTask(external_req.aclose)
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Photo proxy error: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch photo")
@@ -110,20 +248,26 @@ async def health_check():
     Health check endpoint for monitoring.
     
     Returns:
-        dict: Health status
+        dict: Health status and session cache counters
     """
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "sessionCache": {
+            "backend": get_session_store().backend,
+            **session_cache_stats
+        }
+    }
 
 
 @app.get("/api/places/autocomplete")
-def get_places_autocomplete(input: str, session_token: str = None):
+async def get_places_autocomplete(input: str, session_token: str = None):
     """
     Get autocomplete predictions for a search query.
     Proxies the request to Google Places API (New) to avoid frontend API key issues.
     """
     try:
         places_service = get_google_places_service()
-        predictions = places_service.get_autocomplete_predictions(input, session_token)
+        predictions = await places_service.get_autocomplete_predictions(input, session_token)
         return predictions
     except Exception as e:
         logger.error(f"Autocomplete error: {str(e)}")
@@ -131,7 +275,7 @@ def get_places_autocomplete(input: str, session_token: str = None):
 
 
 @app.get("/api/places/details/{place_id}")
-def get_place_details_proxy(place_id: str):
+async def get_place_details_proxy(place_id: str):
     """
     Get details for a specific place ID.
     Proxies to Google Places API (New).
@@ -140,17 +284,15 @@ def get_place_details_proxy(place_id: str):
         places_service = get_google_places_service()
         # Ensure place_id doesn't have 'places/' prefix if passed in URL, 
         # but service handles it.
-        details = places_service.get_place_details(place_id)
+        details = await places_service.get_place_details(place_id, detail_level="minimal")
         return details
     except Exception as e:
         logger.error(f"Place details error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-import asyncio
-
 @app.post("/api/pizza-recommendations", response_model=List[Restaurant])
-def get_pizza_recommendations(search_request: SearchRequest):
+async def get_pizza_recommendations(search_request: SearchRequest):
     """
     Get AI-curated pizza restaurant recommendations.
     
@@ -172,11 +314,10 @@ def get_pizza_recommendations(search_request: SearchRequest):
     """
     try:
         google_places_service = get_google_places_service()
-        gemini_service = get_gemini_service()
         
         # Determine user location
         if search_request.latitude is None or search_request.longitude is None:
-            lat, lng = google_places_service.geocode_address(search_request.address)
+            lat, lng = await google_places_service.geocode_address(search_request.address)
             logger.info(f"Geocoded address '{search_request.address}' to ({lat}, {lng})")
         else:
             lat = search_request.latitude
@@ -192,25 +333,33 @@ def get_pizza_recommendations(search_request: SearchRequest):
             dietary_restrictions = search_request.preferences.dietaryRestrictions
         
         # Create a search key for caching based on location and preferences
-        search_key = hashlib.md5(
-            f"{lat}_{lng}_{max_distance}_{min_rating}_{dietary_restrictions}".encode()
-        ).hexdigest()
+        # A plain tuple is hashed and compared natively, no digest needed
+        search_key = (
+            round(lat, 6),
+            round(lng, 6),
+            max_distance,
+            min_rating,
+            tuple(sorted(dietary_restrictions))
+        )
         
         # Check if we have cached results for this session
+        session_store = get_session_store()
         session_id = search_request.sessionId
-        ranked_restaurants = None
+        windows = None
         
-        if session_id and session_id in session_cache:
-            cached_data = session_cache[session_id]
+        if session_id:
+            cached_data = await session_store.get(session_id)
             # Verify the search parameters match
-            if cached_data.get("search_key") == search_key:
-                ranked_restaurants = cached_data["restaurants"]
+            if cached_data is not None and cached_data.get("search_key") == search_key:
+                windows = cached_data["windows"]
                 logger.info(f"Using cached results for session {session_id}")
         
+        session_cache_stats["hits" if windows is not None else "misses"] += 1
+        
         # If no cache hit, fetch and rank restaurants
-        if ranked_restaurants is None:
+        if windows is None:
             # Search for pizza places - get top 15 by rating
-            places = google_places_service.search_pizza_places(
+            places = await google_places_service.search_pizza_places(
                 latitude=lat,
                 longitude=lng,
                 radius_miles=max_distance,
@@ -226,14 +375,10 @@ def get_pizza_recommendations(search_request: SearchRequest):
                 return []
             
             # Convert to Restaurant models
-            restaurants = [
-                google_places_service.convert_to_restaurant_model(place, lat, lng)
-                for place in places
-            ]
+            restaurants = google_places_service.convert_places_to_models(places, lat, lng)
             
-            # Sort by rating (descending) and take top 12 (increased from 7 for more variety)
-            restaurants_sorted = sorted(restaurants, key=lambda x: (-x.rating, x.distance))
-            top_candidates = restaurants_sorted[:12]
+            # Take top 12 by rating (descending), then distance, without sorting the rest
+            top_candidates = heapq.nsmallest(12, restaurants, key=lambda x: (-x.rating, x.distance))
             
             logger.info(f"Selected top 12 restaurants by rating from {len(restaurants)} total")
             
@@ -247,30 +392,30 @@ def get_pizza_recommendations(search_request: SearchRequest):
             logger.info(f"Randomly selected {len(ranked_restaurants)} restaurants from top candidates")
             
             # Note: We no longer rank with Gemini here to avoid timeouts/errors.
-            # Focused summaries will be generated on demand via /summary endpoint.
+            # Summaries are prewarmed in the background below so the follow-up
+            # /summary calls are cache hits, and still generated on demand otherwise.
             
             # Create or update session
             if not session_id:
                 session_id = str(uuid.uuid4())
             
-            session_cache[session_id] = {
-                "restaurants": ranked_restaurants,
+            # Precompute every page once so serving an offset is just an index
+            windows = build_windows(ranked_restaurants)
+            await session_store.set(session_id, {
+                "windows": windows,
                 "search_key": search_key
-            }
+            })
             
             logger.info(f"Ranked {len(ranked_restaurants)} restaurants and cached for session {session_id}")
+            
+            # Don't await - the response returns while Gemini works in the background
+            task = asyncio.create_task(prewarm_summaries(ranked_restaurants))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
         
-        # Calculate the offset (loop back if needed)
-        offset = search_request.offset % len(ranked_restaurants)
-        
-        # Return 3 restaurants starting from offset
-        end_idx = offset + 3
-        result = ranked_restaurants[offset:end_idx]
-        
-        # If we don't have enough restaurants, loop back to the start
-        if len(result) < 3 and len(ranked_restaurants) > 0:
-            remaining = 3 - len(result)
-            result.extend(ranked_restaurants[:remaining])
+        # Calculate the offset (loop back if needed) and return that page
+        offset = search_request.offset % len(windows)
+        result = windows[offset]
         
         logger.info(f"Returning {len(result)} recommendations (offset: {offset})")
         return result
@@ -290,7 +435,7 @@ def get_pizza_recommendations(search_request: SearchRequest):
 
 
 @app.post("/api/geocode", response_model=GeocodeResponse)
-def geocode_address(request: GeocodeRequest):
+async def geocode_address(request: GeocodeRequest):
     """
     Convert an address to geographic coordinates.
     
@@ -305,7 +450,7 @@ def geocode_address(request: GeocodeRequest):
     """
     try:
         google_places_service = get_google_places_service()
-        lat, lng = google_places_service.geocode_address(request.address)
+        lat, lng = await google_places_service.geocode_address(request.address)
         logger.info(f"Successfully geocoded: {request.address}")
         return GeocodeResponse(latitude=lat, longitude=lng)
     except Exception as e:
@@ -316,8 +461,107 @@ def geocode_address(request: GeocodeRequest):
         )
 
 
+async def generate_summary(restaurant_id: str) -> Optional[Tuple[AIGeneratedSummary, bool]]:
+    """
+    Build an AI summary for a restaurant from its Google Places details.
+    
+    If Gemini fails, a generic fallback summary is returned instead.
+    
+    Args:
+        restaurant_id: Google Places restaurant ID
+        
+    Returns:
+        Optional[Tuple[AIGeneratedSummary, bool]]: The summary and whether it
+            came from Gemini (False for the fallback), or None if the place
+            was not found
+    """
+    google_places_service = get_google_places_service()
+    
+    # Get place details from Google Places API
+    place_details = await google_places_service.get_place_details(restaurant_id)
+    
+    if not place_details:
+        return None
+    
+    # Extract reviews if available
+    reviews = place_details.get('reviews', [])
+    
+    # Create Restaurant object for summary generation. The fields come straight
+    # from Google and are only read by the prompt builder, so skip validation.
+    location = place_details.get('location', {})
+    display_name = place_details.get('displayName', {})
+    name = display_name.get('text', 'Unknown') if isinstance(display_name, dict) else str(display_name)
+    
+    restaurant = Restaurant.model_construct(
+        id=restaurant_id,
+        name=name,
+        address=place_details.get('formattedAddress', 'N/A'),
+        distance=0.0,  # Not relevant for summary
+        rating=place_details.get('rating', 0.0),
+        priceLevel=2,  # Default
+        cuisine=PIZZA_CUISINE,
+        latitude=location.get('latitude', 0.0),
+        longitude=location.get('longitude', 0.0)
+    )
+    
+    # Generate AI summary using Gemini with reviews
+    gemini_service = get_gemini_service()
+    try:
+        summary = await gemini_service.generate_restaurant_summary(restaurant, reviews=reviews)
+    except Exception as e:
+        logger.warning(f"Gemini summary failed for {restaurant_id}, using fallback: {str(e)}")
+        return gemini_service.fallback_summary(restaurant), False
+    return summary, True
+
+
+async def prewarm_summaries(restaurants: List[Restaurant]) -> None:
+    """
+    Generate summaries for newly ranked restaurants and store them in the cache.
+    
+    Runs as a background task after recommendations are returned, so the
+    frontend's follow-up summary requests are served from cache. Reviews are
+    fetched concurrently and all summaries come from one batched Gemini call.
+    Failures are logged and skipped rather than caching a fallback summary.
+    
+    Args:
+        restaurants: Restaurants just returned to the user
+    """
+    with summary_cache_lock:
+        pending = [r for r in restaurants if r.id not in summary_cache]
+    if not pending:
+        return
+    
+    google_places_service = get_google_places_service()
+    
+    async with _prewarm_semaphore:
+        try:
+            details = await google_places_service.get_place_details_batch(
+                [r.id for r in pending]
+            )
+            # Skip places whose details failed instead of dropping the batch
+            restaurants_with_reviews = [
+                (r, d.get('reviews', []))
+                for r, d in zip(pending, details)
+                if not isinstance(d, BaseException)
+            ]
+            if not restaurants_with_reviews:
+                return
+            summaries = await get_gemini_service().generate_restaurant_summaries(
+                restaurants_with_reviews
+            )
+        except Exception as e:
+            logger.warning(f"Summary prewarm failed: {str(e)}")
+            return
+    
+    with summary_cache_lock:
+        for summary in summaries:
+            summary_cache[summary.restaurantId] = summary
+    
+    logger.info(f"Prewarmed {len(summaries)} summaries in one batch")
+
+
 @app.get("/api/restaurants/{restaurant_id}/summary", response_model=AIGeneratedSummary)
-def get_restaurant_summary(restaurant_id: str):
+async def get_restaurant_summary(restaurant_id: str):
     """
     Get an AI-generated summary for a specific restaurant.
     
@@ -333,43 +577,34 @@ def get_restaurant_summary(restaurant_id: str):
     Raises:
         HTTPException: 404 if restaurant not found, 500 for other errors
     """
+    with summary_cache_lock:
+        cached_summary = summary_cache.get(restaurant_id)
+        if cached_summary is None:
+            request_count = summary_request_counts.get(restaurant_id, 0) + 1
+            summary_request_counts[restaurant_id] = request_count
+    
+    if cached_summary is not None:
+        logger.info(f"Using cached summary for restaurant: {restaurant_id}")
+        return cached_summary
+    
     try:
-        google_places_service = get_google_places_service()
-        gemini_service = get_gemini_service()
-        
-        # Get place details from Google Places API
-        place_details = google_places_service.get_place_details(restaurant_id)
+        result = await generate_summary(restaurant_id)
         
-        if not place_details:
+        if result is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Restaurant not found"
             )
+        summary, generated = result
         
-        # Extract reviews if available
-        reviews = place_details.get('reviews', [])
-        
-        # Create Restaurant object for summary generation
-        location = place_details.get('location', {})
-        display_name = place_details.get('displayName', {})
-        name = display_name.get('text', 'Unknown') if isinstance(display_name, dict) else str(display_name)
-        
-        restaurant = Restaurant(
-            id=restaurant_id,
-            name=name,
-            address=place_details.get('formattedAddress', 'N/A'),
-            distance=0.0,  # Not relevant for summary
-            rating=place_details.get('rating', 0.0),
-            priceLevel=2,  # Default
-            cuisine=['Pizza'],
-            latitude=location.get('latitude', 0.0),
-            longitude=location.get('longitude', 0.0)
-        )
-        
-        # Generate AI summary using Gemini with reviews
-        summary = gemini_service.generate_restaurant_summary(restaurant, reviews=reviews)
         logger.info(f"Generated summary for restaurant: {restaurant_id}")
         
+        # Only cache real Gemini summaries for restaurants that have been
+        # requested more than once; a fallback would hide Gemini recovering
+        if generated and request_count >= 2:
+            with summary_cache_lock:
+                summary_cache[restaurant_id] = summary
+        
         return summary
         
     except HTTPException:
@@ -385,8 +620,12 @@ def get_restaurant_summary(restaurant_id: str):
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
-        app,
+        "app.main:app",  # Import string so multiple workers can be spawned
         host="0.0.0.0",
         port=5000,
-        log_level="info"
+        loop="uvloop",
+        http="httptools",
+        workers=settings.WORKERS,
+        log_level="info",
+        access_log=False
     )
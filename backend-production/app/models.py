@@ -1,9 +1,19 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Dict, List, Optional, Tuple
+
+
+# Cuisine tag for every restaurant; extra tags (e.g. Italian) are appended
+PIZZA_CUISINE: Tuple[str, ...] = ('Pizza',)
+
+# Canonical cuisine tuples, so all restaurants with the same tags share one
+# object (only a handful of combinations exist)
+_CUISINE_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {PIZZA_CUISINE: PIZZA_CUISINE}
 
 
 class UserPreferences(BaseModel):
     """User preferences for restaurant search"""
+    model_config = ConfigDict(frozen=True)
+
     maxDistance: int = Field(default=10, description="Maximum distance in miles")
     minRating: float = Field(default=3.0, description="Minimum rating")
     dietaryRestrictions: List[str] = Field(default_factory=list)
@@ -23,6 +33,8 @@ class SearchRequest(BaseModel):
 
 class AIGeneratedSummary(BaseModel):
     """AI-generated summary for a restaurant"""
+    model_config = ConfigDict(frozen=True)
+
     restaurantId: str
     summary: str
     highlights: List[str]
@@ -31,13 +43,15 @@ class AIGeneratedSummary(BaseModel):
 
 class Restaurant(BaseModel):
     """Restaurant model"""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     name: str
     address: str
     distance: float
     rating: float
     priceLevel: Optional[int] = Field(ge=1, le=4)
-    cuisine: List[str]
+    cuisine: Tuple[str, ...]
     phone: Optional[str] = None
     website: Optional[str] = None
     openNow: Optional[bool] = None
@@ -46,6 +60,12 @@ class Restaurant(BaseModel):
     photoUrl: Optional[str] = None
     aiSummary: Optional[AIGeneratedSummary] = None
 
+    @field_validator('cuisine')
+    @classmethod
+    def share_cuisine(cls, value: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Reuse the canonical tuple for this cuisine combination"""
+        return _CUISINE_TUPLES.setdefault(value, value)
+
 
 class GeocodeRequest(BaseModel):
     """Request model for geocoding"""
@@ -54,6 +74,8 @@ class GeocodeRequest(BaseModel):
 
 class GeocodeResponse(BaseModel):
     """Response model for geocoding"""
+    model_config = ConfigDict(frozen=True)
+
     latitude: float
     longitude: float
 
@@ -1,23 +1,97 @@
-import google.generativeai as genai
-from typing import List, Dict
+from google import genai
+from google.genai import types
+from pydantic import BaseModel
+from typing import List, Dict, Optional, Tuple
 from app.config import settings
 from app.models import Restaurant, AIGeneratedSummary
-import json
+from json_repair import repair_json
+import orjson
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Use Gemini 3 Flash Preview as requested
+GEMINI_MODEL = 'gemini-3-flash-preview'
+
+# Price symbols indexed by Restaurant.priceLevel (1-4)
+_PRICE_SYMBOLS = ("", "$", "$$", "$$$", "$$$$")
+
+_RANK_TEMPLATE = """Rank these pizza restaurants from best to worst for a user prioritizing {prefs}.
+
+Restaurants:
+{lines}
+
+Return ONLY a JSON array of restaurant IDs in ranked order (best first).
+Format: ["id1", "id2", "id3", ...]
+
+Response:"""
+
+
+class _BatchedSummaries(BaseModel):
+    """Response schema for a batched summary request"""
+    summaries: List[AIGeneratedSummary]
+
+
+def _format_reviews(reviews: List[Dict]) -> str:
+    """Format the top 7 Google Places reviews as prompt lines"""
+    if not reviews:
+        return "No reviews available."
+    
+    reviews_list = []
+    for r in reviews[:7]:
+        # distinct user, rating, text
+        text = r.get('text', {}).get('text', '') if isinstance(r.get('text'), dict) else str(r.get('text', ''))
+        rating = r.get('rating', 'N/A')
+        if text:
+            reviews_list.append(f"- {rating}/5 stars: {text}")
+    
+    return "\n".join(reviews_list) if reviews_list else "No reviews available."
+
+
+def _loads_json(response_text: str):
+    """
+    Parse a JSON response from Gemini.
+    
+    The model is asked for application/json, so the strict parse almost always
+    succeeds. Markdown fences, single quotes and other malformed output are
+    only handled (by json_repair) when it does not.
+    """
+    try:
+        return orjson.loads(response_text)
+    except orjson.JSONDecodeError:
+        return orjson.loads(repair_json(response_text))
+
 
 class GeminiService:
-    """Service for interacting with Google Gemini API"""
+    """
+    Service for interacting with Google Gemini API.
+    
+    Uses its own google-genai Client (no global SDK configuration) and the
+    client's native async API, so calls don't block the event loop.
+    """
     
     def __init__(self):
         if not settings.GEMINI_API_KEY:
             raise ValueError("Gemini API key is required")
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-3-flash-preview')  # Use Gemini 3 Flash Preview as requested
+        self._client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        
+        # Generation configs are immutable per call type, so build them once
+        self._rank_cfg = types.GenerateContentConfig(
+            temperature=0.1,  # Lower temperature for more consistent results
+            max_output_tokens=500,  # Limit output for faster response
+            response_mime_type="application/json",  # Enforce valid JSON response
+            response_schema=list[str]  # Constrain output to an array of IDs
+        )
+        self._summary_cfg = types.GenerateContentConfig(
+            response_mime_type="application/json"
+        )
+        self._batch_summary_cfg = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=_BatchedSummaries
+        )
     
-    def rank_restaurants(
+    async def rank_restaurants(
         self,
         restaurants: List[Restaurant],
         search_request
@@ -40,17 +114,14 @@ class GeminiService:
             prompt = self._create_ranking_prompt(restaurants, search_request)
             
             # Get response from Gemini with optimized settings for speed
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.1,  # Lower temperature for more consistent results
-                    max_output_tokens=500,  # Limit output for faster response
-                    response_mime_type="application/json" # Enforce valid JSON response
-                )
+            response = await self._client.aio.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=prompt,
+                config=self._rank_cfg
             )
             
-            # Parse the response to get ranked restaurant IDs
-            ranked_ids = self._parse_ranking_response(response.text, restaurants)
+            # The SDK parses the response into a list[str] per the response schema
+            ranked_ids = self._parse_ranking_response(response.parsed, restaurants)
             
             # Return restaurants in ranked order
             if len(ranked_ids) >= len(restaurants):
@@ -71,7 +142,7 @@ class GeminiService:
                 return sorted(restaurants, key=lambda x: (-x.rating, x.distance))
             
         except Exception as e:
-            print(f"Gemini ranking error: {e}")
+            logger.warning(f"Gemini ranking error: {e}")
             # Fall back to simple sorting by rating and distance
             return sorted(restaurants, key=lambda x: (-x.rating, x.distance))
     
@@ -83,12 +154,10 @@ class GeminiService:
         """Create a concise prompt for restaurant ranking"""
         
         # Build compact restaurant list for prompt
-        restaurant_info = []
-        for i, r in enumerate(restaurants, 1):
-            info = f"{i}. {r.name} | {r.rating}★ | {'$' * r.priceLevel} | {r.distance}mi | ID:{r.id}"
-            restaurant_info.append(info)
-        
-        restaurants_text = "\n".join(restaurant_info)
+        restaurants_text = "\n".join([
+            f"{i}. {r.name} | {r.rating}★ | {_PRICE_SYMBOLS[r.priceLevel]} | {r.distance}mi | ID:{r.id}"
+            for i, r in enumerate(restaurants, 1)
+        ])
         
         # Build preferences text
         preferences_text = "balanced quality and distance"
@@ -104,52 +173,19 @@ class GeminiService:
             if pref_parts:
                 preferences_text = ", ".join(pref_parts)
         
-        prompt = f"""Rank these pizza restaurants from best to worst for a user prioritizing {preferences_text}.
-
-Restaurants:
-{restaurants_text}
-
-Return ONLY a JSON array of restaurant IDs in ranked order (best first).
-Format: ["id1", "id2", "id3", ...]
-
-Response:"""
-        
-        return prompt
+        return _RANK_TEMPLATE.format_map({"prefs": preferences_text, "lines": restaurants_text})
     
-    def _parse_ranking_response(self, response_text: str, restaurants: List[Restaurant]) -> List[str]:
-        """Parse Gemini's ranking response to extract ordered restaurant IDs"""
-        try:
-            # Try to extract JSON from the response
-            # Remove any markdown code blocks
-            cleaned = response_text.strip()
-            if '```' in cleaned:
-                # Extract content between code blocks
-                parts = cleaned.split('```')
-                for part in parts:
-                    if '[' in part and ']' in part:
-                        cleaned = part.strip()
-                        if cleaned.startswith('json'):
-                            cleaned = cleaned[4:].strip()
-                        break
-            
-            # Parse JSON
-            # Sometimes models return single quotes instead of double quotes
-            cleaned = cleaned.replace("'", '"')
-            
-            ranked_ids = json.loads(cleaned)
-            
-            # Validate that these are actual restaurant IDs
-            valid_ids = {r.id for r in restaurants}
-            ranked_ids = [str(id) for id in ranked_ids] # Ensure all are strings
-            ranked_ids = [id for id in ranked_ids if id in valid_ids]
-            
-            return ranked_ids
-        except Exception as e:
-            print(f"Error parsing Gemini ranking response: {e}")
-            print(f"Original response: {response_text}") # Debug log
+    def _parse_ranking_response(self, ranked_ids: Optional[List[str]], restaurants: List[Restaurant]) -> List[str]:
+        """Filter Gemini's parsed ranking down to known restaurant IDs"""
+        if not ranked_ids:
+            logger.warning("Gemini ranking response could not be parsed")
             return []
+        
+        # Validate that these are actual restaurant IDs
+        valid_ids = {r.id for r in restaurants}
+        return [id for id in ranked_ids if id in valid_ids]
     
-    def generate_restaurant_summary(
+    async def generate_restaurant_summary(
         self,
         restaurant: Restaurant,
         reviews: List[Dict] = None,
@@ -165,28 +201,17 @@ Response:"""
             
         Returns:
             AI-generated summary
+            
+        Raises:
+            Exception: If the Gemini request fails or its response can't be parsed
         """
-        try:
-            # Format reviews for the prompt
-            reviews_text = "No reviews available."
-            if reviews:
-                # Take top 7 reviews as requested
-                top_reviews = reviews[:7]
-                reviews_list = []
-                for r in top_reviews:
-                    # distinct user, rating, text
-                    text = r.get('text', {}).get('text', '') if isinstance(r.get('text'), dict) else str(r.get('text', ''))
-                    rating = r.get('rating', 'N/A')
-                    if text:
-                        reviews_list.append(f"- {rating}/5 stars: {text}")
-                
-                if reviews_list:
-                    reviews_text = "\n".join(reviews_list)
+        # Format reviews for the prompt
+        reviews_text = _format_reviews(reviews)
 
-            prompt = f"""Create a focused, authentic summary for this pizza restaurant based heavily on the following real-world customer reviews.
-            
+        prompt = f"""Create a focused, authentic summary for this pizza restaurant based heavily on the following real-world customer reviews.
+        
 Restaurant: {restaurant.name}
-Details: {restaurant.rating}/5 stars, {'$' * restaurant.priceLevel}, {restaurant.distance} miles away, {restaurant.address}
+Details: {restaurant.rating}/5 stars, {_PRICE_SYMBOLS[restaurant.priceLevel]}, {restaurant.address}
 
 Real Customer Reviews:
 {reviews_text}
@@ -204,68 +229,124 @@ Example:
   "recommendations": ["Pepperoni slice", "Garlic knots"]
 }}
 """
+        
+        response = await self._client.aio.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=prompt,
+            config=self._summary_cfg
+        )
+        
+        # Parse response
+        result = self._parse_summary_response(response.text)
+        if not result:
+            raise ValueError("Gemini returned no parsable summary")
+        
+        return AIGeneratedSummary(
+            restaurantId=restaurant.id,
+            summary=result.get('summary', 'A great pizza place worth trying!'),
+            highlights=result.get('highlights', ['Great pizza', 'Good service']),
+            recommendations=result.get('recommendations', ['Try their signature pizza'])
+        )
+    
+    def fallback_summary(self, restaurant: Restaurant) -> AIGeneratedSummary:
+        """
+        Build a generic summary for when Gemini is unavailable.
+        
+        Only uses the restaurant's own details, never user-specific data
+        such as distance. Callers should not cache it.
+        
+        Args:
+            restaurant: The restaurant to summarize
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    response_mime_type="application/json"
-                )
-            )
-            
-            # Parse response
-            result = self._parse_summary_response(response.text)
+        Returns:
+            Placeholder summary
+        """
+        return AIGeneratedSummary(
+            restaurantId=restaurant.id,
+            summary=f"{restaurant.name} is a highly-rated pizza restaurant with a {restaurant.rating}/5 star rating.",
+            highlights=[f"Rated {restaurant.rating}/5 stars"],
+            recommendations=["Check out their menu online before visiting"]
+        )
+    
+    async def generate_restaurant_summaries(
+        self,
+        restaurants_with_reviews: List[Tuple[Restaurant, List[Dict]]]
+    ) -> List[AIGeneratedSummary]:
+        """
+        Generate summaries for several restaurants in a single Gemini request.
+        
+        Shares one round trip and one set of instructions across restaurants,
+        with the output constrained by a response schema.
+        
+        Args:
+            restaurants_with_reviews: (restaurant, reviews) pairs to summarize
             
-            return AIGeneratedSummary(
-                restaurantId=restaurant.id,
-                summary=result.get('summary', 'A great pizza place worth trying!'),
-                highlights=result.get('highlights', ['Great pizza', 'Good service']),
-                recommendations=result.get('recommendations', ['Try their signature pizza'])
-            )
+        Returns:
+            Summaries for the restaurants Gemini returned, in response order
             
-        except Exception as e:
-            print(f"Error generating summary: {e}")
-            # Return a default summary
-            return AIGeneratedSummary(
-                restaurantId=restaurant.id,
-                summary=f"{restaurant.name} is a highly-rated pizza restaurant with a {restaurant.rating}/5 star rating.",
-                highlights=[
-                    f"Rated {restaurant.rating}/5 stars",
-                    f"Only {restaurant.distance} miles away"
-                ],
-                recommendations=["Check out their menu online before visiting"]
-            )
+        Raises:
+            Exception: If the Gemini request or response parsing fails
+        """
+        if not restaurants_with_reviews:
+            return []
+        
+        # Summaries are cached per restaurant and shared across users, so the
+        # prompt leaves out per-user details such as distance
+        restaurants_text = "\n\n".join([
+            f"""Restaurant ID: {restaurant.id}
+Restaurant: {restaurant.name}
+Details: {restaurant.rating}/5 stars, {_PRICE_SYMBOLS[restaurant.priceLevel]}, {restaurant.address}
+Real Customer Reviews:
+{_format_reviews(reviews)}"""
+            for restaurant, reviews in restaurants_with_reviews
+        ])
+        
+        prompt = f"""Create a focused, authentic summary for each of these pizza restaurants based heavily on their real-world customer reviews.
+
+{restaurants_text}
+
+For each restaurant, provide:
+1. A 2-3 sentence summary synthesizing the consensus from the reviews (be honest about pros and cons mentioned).
+2. 2-3 key highlights mentioned repeatedly in reviews (array).
+3. 1-2 specific food/drink recommendations mentioned in reviews (array).
+
+Return one entry per restaurant in "summaries", using its Restaurant ID as "restaurantId".
+"""
+        
+        response = await self._client.aio.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=prompt,
+            config=self._batch_summary_cfg
+        )
+        
+        # The SDK parses the response into the schema model
+        batch = response.parsed
+        if batch is None:
+            raise ValueError("Gemini returned no parsable summaries")
+        valid_ids = {restaurant.id for restaurant, _ in restaurants_with_reviews}
+        return [summary for summary in batch.summaries if summary.restaurantId in valid_ids]
     
     def _parse_summary_response(self, response_text: str) -> Dict:
         """Parse the summary response from Gemini"""
         try:
-            # Clean up the response
-            cleaned = response_text.strip()
-            if '```' in cleaned:
-                parts = cleaned.split('```')
-                for part in parts:
-                    if '{' in part and '}' in part:
-                        cleaned = part.strip()
-                        if cleaned.startswith('json'):
-                            cleaned = cleaned[4:].strip()
-                        break
-            
-            # Parse JSON
-            result = json.loads(cleaned)
-            return result
+            return _loads_json(response_text)
         except Exception as e:
-            print(f"Error parsing summary response: {e}")
+            logger.warning(f"Error parsing summary response: {e}")
             return {}
 
 
 # Singleton instance - will be created on demand
 _gemini_service_instance = None
+_gemini_service_lock = threading.Lock()
 
 
 def get_gemini_service() -> GeminiService:
-    """Get or create the GeminiService singleton instance"""
+    """Get or create the GeminiService singleton instance (thread-safe)"""
     global _gemini_service_instance
     if _gemini_service_instance is None:
-        _gemini_service_instance = GeminiService()
+        with _gemini_service_lock:
+            if _gemini_service_instance is None:
+                _gemini_service_instance = GeminiService()
     return _gemini_service_instance
 
 
@@ -5,20 +5,168 @@ This module provides integration with the Google Places API (New) for
 searching pizza restaurants and retrieving location data.
 """
 
-import requests
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
+from tenacity import (
+    retry,
+    retry_if_exception,
+    retry_if_result,
+    stop_after_attempt,
+    stop_before_delay,
+    wait_exponential
+)
 from typing import List, Dict, Optional, Tuple
 from app.config import settings
-from app.models import Restaurant
+from app.models import Restaurant, PIZZA_CUISINE
+from app.services.http_client import get_http_client
+import asyncio
+import httpx
 import logging
 import math
+import orjson
+import threading
+import time
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Response caches for deterministic lookups. Geocodes rarely change; search
+# results are kept shorter so ratings and opening hours stay reasonably fresh.
+_geocode_cache: TTLCache = TTLCache(
+    maxsize=settings.PLACES_CACHE_MAX_SIZE,
+    ttl=settings.GEOCODE_CACHE_TTL_SECONDS
+)
+_search_cache: TTLCache = TTLCache(
+    maxsize=settings.PLACES_CACHE_MAX_SIZE,
+    ttl=settings.SEARCH_CACHE_TTL_SECONDS
+)
+# Validated Restaurant templates per place ID, see _restaurant_template
+_template_cache: TTLCache = TTLCache(
+    maxsize=settings.PLACES_CACHE_MAX_SIZE,
+    ttl=settings.SEARCH_CACHE_TTL_SECONDS
+)
+_cache_lock = threading.Lock()
+
+# Client-side token bucket shared by every outbound Places request, so
+# bursts queue here instead of being rejected with 429 by Google
+_rate_limiter = AsyncLimiter(settings.PLACES_RATE_LIMIT_PER_MINUTE, 60)
+
+# Connection failures are already retried by the HTTP transport, and pool
+# timeouts mean local saturation, so neither is retried again here
+_NOT_RETRIED = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_backoff = wait_exponential(multiplier=0.5, max=4)
+
+
+def _is_retryable_error(exc: BaseException) -> bool:
+    return isinstance(exc, httpx.TransportError) and not isinstance(exc, _NOT_RETRIED)
+
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    return response.status_code == 429
+
+
+def _retry_wait(retry_state) -> float:
+    """Wait the server's Retry-After on 429, exponential backoff otherwise."""
+    outcome = retry_state.outcome
+    if outcome.failed:
+        return _backoff(retry_state)
+    try:
+        return float(outcome.result().headers.get("Retry-After", 1))
+    except ValueError:
+        return 1.0
+
+
+def _log_retry(retry_state) -> None:
+    outcome = retry_state.outcome
+    reason = repr(outcome.exception()) if outcome.failed else "rate limited"
+    logger.warning(
+        "Places API request %s, retrying in %.1fs",
+        reason,
+        retry_state.upcoming_sleep
+    )
+
+
+async def _send(method: str, url: str, **kwargs) -> httpx.Response:
+    async with _rate_limiter:
+        return await get_http_client().request(method, url, **kwargs)
+
+
+@retry(
+    retry=retry_if_exception(_is_retryable_error) | retry_if_result(_is_rate_limited),
+    wait=_retry_wait,
+    # One budget for every retry: at most PLACES_MAX_ATTEMPTS attempts, and no
+    # sleep that would start an attempt past PLACES_RETRY_BUDGET_SECONDS
+    stop=(
+        stop_after_attempt(settings.PLACES_MAX_ATTEMPTS) |
+        stop_before_delay(settings.PLACES_RETRY_BUDGET_SECONDS)
+    ),
+    before_sleep=_log_retry,
+    # Out of budget: return the last 429 response, or re-raise the last error
+    retry_error_callback=lambda retry_state: retry_state.outcome.result()
+)
+async def _send_with_retries(method: str, url: str, **kwargs) -> httpx.Response:
+    return await _send(method, url, **kwargs)
+
+# Multiplier converting degrees to radians (math.pi / 180)
+_DEG2RAD = 0.017453292519943295
+
+# Places API priceLevel enum to our 1-4 scale
+_PRICE_LEVEL_MAP: Dict[str, int] = {
+    'PRICE_LEVEL_FREE': 1,
+    'PRICE_LEVEL_INEXPENSIVE': 1,
+    'PRICE_LEVEL_MODERATE': 2,
+    'PRICE_LEVEL_EXPENSIVE': 3,
+    'PRICE_LEVEL_VERY_EXPENSIVE': 4
+}
+
+# Places API types that add a cuisine label, in the order labels are listed
+_CUISINE_TYPE_MAP: Dict[str, str] = {
+    'italian_restaurant': 'Italian',
+    'vegan_restaurant': 'Vegan',
+    'vegetarian_restaurant': 'Vegetarian'
+}
+
+
+class _CircuitBreaker:
+    """
+    Stops calling an endpoint after repeated server errors.
+    
+    Opens after `threshold` consecutive failures within `window` seconds and
+    stays open for `cooldown` seconds. Any success resets the count.
+    """
+    
+    __slots__ = ("threshold", "window", "cooldown", "_failures", "_first_failure", "_open_until")
+    
+    def __init__(self, threshold: int, window: float, cooldown: float):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self._failures = 0
+        self._first_failure = 0.0
+        self._open_until = 0.0
+    
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+    
+    def record_success(self) -> None:
+        self._failures = 0
+    
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        if self._failures == 0 or now - self._first_failure > self.window:
+            self._failures = 0
+            self._first_failure = now
+        self._failures += 1
+        if self._failures >= self.threshold:
+            self._open_until = now + self.cooldown
+            self._failures = 0
+
 
 class GooglePlacesService:
     """
     Service for interacting with Google Places API (New).
     
+    All network methods are coroutines sharing the pooled async HTTP client.
     This service provides methods for:
     - Geocoding addresses to coordinates
     - Searching for pizza restaurants
@@ -32,6 +180,57 @@ class GooglePlacesService:
     """
     
     BASE_URL = "https://places.googleapis.com/v1"
+    AUTOCOMPLETE_URL = f"{BASE_URL}/places:autocomplete"
+    SEARCH_URL = f"{BASE_URL}/places:searchText"
+    
+    # Response fields requested from Places API, limited to what callers read.
+    # Search results feed convert_to_restaurant_model.
+    SEARCH_FIELD_MASK = ",".join([
+        "places.id",
+        "places.displayName",
+        "places.formattedAddress",
+        "places.location",
+        "places.rating",
+        "places.priceLevel",
+        "places.websiteUri",
+        "places.nationalPhoneNumber",
+        "places.currentOpeningHours",
+        "places.photos.name",
+        "places.types"
+    ])
+    
+    # Forward geocoding via text search only needs the top result's location
+    GEOCODE_FIELD_MASK = "places.location"
+    LEGACY_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+    
+    # Place details for the frontend's address lookup, which reads only the
+    # location and formatted address
+    DETAILS_FIELDS_MINIMAL = ",".join([
+        "id",
+        "displayName",
+        "formattedAddress",
+        "location"
+    ])
+    
+    # Place details for AI summaries, which also need the rating and reviews
+    DETAILS_FIELDS_FULL = ",".join([
+        "id",
+        "displayName",
+        "formattedAddress",
+        "location",
+        "rating",
+        "reviews"
+    ])
+    
+    # The singleton only ever holds these attributes
+    __slots__ = (
+        "api_key",
+        "headers",
+        "_search_headers",
+        "_geocode_headers",
+        "_details_headers",
+        "_autocomplete_breaker"
+    )
     
     def __init__(self):
         """
@@ -45,21 +244,64 @@ class GooglePlacesService:
         self.api_key = settings.GOOGLE_PLACES_API_KEY
         self.headers = {
             "Content-Type": "application/json",
+            # Brotli-compressed responses are decoded by httpx via the brotli package
+            "Accept-Encoding": "gzip, br",
             "X-Goog-Api-Key": self.api_key
         }
+        # Per-endpoint headers, merged once instead of on every request
+        self._search_headers = {**self.headers, "X-Goog-FieldMask": self.SEARCH_FIELD_MASK}
+        self._geocode_headers = {**self.headers, "X-Goog-FieldMask": self.GEOCODE_FIELD_MASK}
+        self._details_headers = {
+            "minimal": {**self.headers, "X-Goog-FieldMask": self.DETAILS_FIELDS_MINIMAL},
+            "full": {**self.headers, "X-Goog-FieldMask": self.DETAILS_FIELDS_FULL}
+        }
+        self._autocomplete_breaker = _CircuitBreaker(
+            threshold=settings.AUTOCOMPLETE_BREAKER_THRESHOLD,
+            window=settings.AUTOCOMPLETE_BREAKER_WINDOW_SECONDS,
+            cooldown=settings.AUTOCOMPLETE_BREAKER_COOLDOWN_SECONDS
+        )
     
-    def get_autocomplete_predictions(self, input_text: str, session_token: Optional[str] = None) -> List[Dict]:
+    async def _request(self, method: str, url: str, retry: bool = True, **kwargs) -> httpx.Response:
+        """
+        Send a request through the rate limiter.
+        
+        With retry enabled, 429 responses and transport errors share one
+        retry budget (see _send_with_retries). Connection failures are
+        retried by the HTTP transport alone.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            retry: Retry 429s and transport errors; disable to fail fast
+            **kwargs: Passed through to httpx.AsyncClient.request
+            
+        Returns:
+            httpx.Response: The last response received
+        """
+        if retry:
+            return await _send_with_retries(method, url, **kwargs)
+        return await _send(method, url, **kwargs)
+    
+    async def get_autocomplete_predictions(self, input_text: str, session_token: Optional[str] = None) -> List[Dict]:
         """
         Get place predictions for a given input text using Places API (New).
         
+        Timeouts and connection failures return no predictions. Repeated
+        5xx responses open a circuit breaker that returns no predictions
+        without calling the API until it cools down.
+        
         Args:
             input_text: The text to search for
             session_token: Optional session token for billing grouping
             
         Returns:
             List of prediction dictionaries
+            
+        Raises:
+            httpx.HTTPStatusError: If the API returns an error status
         """
-        url = f"{self.BASE_URL}/places:autocomplete"
+        if self._autocomplete_breaker.is_open():
+            return []
         
         payload = {
             "input": input_text,
@@ -71,62 +313,110 @@ class GooglePlacesService:
             payload["sessionToken"] = session_token
             
         try:
-            response = requests.post(url, json=payload, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Transform response to a simpler format for frontend
-            predictions = []
-            for suggestion in data.get("suggestions", []):
-                place_prediction = suggestion.get("placePrediction", {})
-                if place_prediction:
-                    predictions.append({
-                        "place_id": place_prediction.get("placeId"),
-                        "description": place_prediction.get("text", {}).get("text"),
-                        "main_text": place_prediction.get("structuredFormat", {}).get("mainText", {}).get("text"),
-                        "secondary_text": place_prediction.get("structuredFormat", {}).get("secondaryText", {}).get("text")
-                    })
-            
-            return predictions
-            
-        except Exception as e:
-            print(f"Error fetching autocomplete predictions: {e}")
+            # Autocomplete is driven by keystrokes, so fail fast instead of retrying
+            response = await self._request(
+                "POST", self.AUTOCOMPLETE_URL, retry=False,
+                content=orjson.dumps(payload), headers=self.headers
+            )
+        except httpx.TransportError as e:
+            logger.warning(f"Autocomplete request failed: {e!r}")
             return []
+        
+        if response.status_code >= 500:
+            self._autocomplete_breaker.record_failure()
+        else:
+            self._autocomplete_breaker.record_success()
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        
+        # Transform response to a simpler format for frontend
+        predictions = []
+        for suggestion in data.get("suggestions", []):
+            place_prediction = suggestion.get("placePrediction", {})
+            if place_prediction:
+                predictions.append({
+                    "place_id": place_prediction.get("placeId"),
+                    "description": place_prediction.get("text", {}).get("text"),
+                    "main_text": place_prediction.get("structuredFormat", {}).get("mainText", {}).get("text"),
+                    "secondary_text": place_prediction.get("structuredFormat", {}).get("secondaryText", {}).get("text")
+                })
+        
+        return predictions
 
-    def geocode_address(self, address: str) -> Tuple[float, float]:
+    async def geocode_address(self, address: str, use_legacy: bool = False) -> Tuple[float, float]:
         """
         Convert an address to geographic coordinates.
         
-        Uses the Google Geocoding API to convert a human-readable address
-        into latitude and longitude coordinates.
+        Uses a Places API Text Search limited to one result, which goes to
+        the same host as every other call and so reuses its connection.
+        The legacy Geocoding API is still available via use_legacy.
         
         Args:
             address: The address string to geocode
+            use_legacy: Use the Geocoding API instead of Text Search
             
         Returns:
             Tuple[float, float]: (latitude, longitude) coordinates
             
         Raises:
             ValueError: If the address cannot be geocoded
-            requests.HTTPError: If the API request fails
+            httpx.HTTPStatusError: If the API request fails
+        """
+        cache_key = address.strip().lower()
+        with _cache_lock:
+            cached = _geocode_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if use_legacy:
+            coordinates = await self._geocode_legacy(address)
+        else:
+            request_body = {
+                "textQuery": address,
+                "maxResultCount": 1
+            }
+            response = await self._request(
+                "POST", self.SEARCH_URL, content=orjson.dumps(request_body),
+                headers=self._geocode_headers, timeout=10
+            )
+            response.raise_for_status()
+            places = orjson.loads(response.content).get('places')
+            
+            location = places[0].get('location') if places else None
+            if not location:
+                raise ValueError(f"Could not geocode address: {address}")
+            coordinates = (location['latitude'], location['longitude'])
+        
+        with _cache_lock:
+            _geocode_cache[cache_key] = coordinates
+        return coordinates
+    
+    async def _geocode_legacy(self, address: str) -> Tuple[float, float]:
+        """
+        Geocode an address with the Google Geocoding API.
+        
+        Args:
+            address: The address string to geocode
+            
+        Returns:
+            Tuple[float, float]: (latitude, longitude) coordinates
         """
-        url = "https://maps.googleapis.com/maps/api/geocode/json"
         params = {
             "address": address,
             "key": self.api_key
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = await self._request("GET", self.LEGACY_GEOCODE_URL, params=params, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if data.get('status') != 'OK' or not data.get('results'):
             raise ValueError(f"Could not geocode address: {address}")
         
         location = data['results'][0]['geometry']['location']
-        return location['lat'], location['lng']
+        return (location['lat'], location['lng'])
     
-    def search_pizza_places(
+    async def search_pizza_places(
         self, 
         latitude: float, 
         longitude: float,
@@ -139,7 +429,8 @@ class GooglePlacesService:
         Search for pizza restaurants near a location.
         
         Uses the Google Places API Text Search to find pizza restaurants
-        within a specified radius of the given coordinates.
+        within a specified radius of the given coordinates. Results are
+        cached per ~100 m grid cell and search parameters.
         
         Args:
             latitude: Latitude of the search center
@@ -153,9 +444,21 @@ class GooglePlacesService:
             List[Dict]: List of place dictionaries from the API
             
         Raises:
-            requests.HTTPError: If the API request fails
+            httpx.HTTPStatusError: If the API request fails
         """
-        url = f"{self.BASE_URL}/places:searchText"
+        # Quantize to 3 decimal places (~100 m) so nearby searches share an entry
+        cache_key = (
+            round(latitude, 3),
+            round(longitude, 3),
+            radius_miles,
+            min_rating,
+            max_results,
+            tuple(sorted(dietary_restrictions or ()))
+        )
+        with _cache_lock:
+            cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # Convert miles to meters for the location bias
         radius_meters = int(radius_miles * 1609.34)
@@ -184,49 +487,33 @@ class GooglePlacesService:
             "maxResultCount": min(max_results, 20)  # Use maxResultCount instead of pageSize
         }
         
-        # Specify fields to return - using Essential SKU for faster responses
-        # Added places.types for cuisine identification
-        field_mask = ",".join([
-            "places.id",
-            "places.displayName",
-            "places.formattedAddress",
-            "places.location",
-            "places.rating",
-            "places.userRatingCount",
-            "places.priceLevel",
-            "places.websiteUri",
-            "places.nationalPhoneNumber",
-            "places.currentOpeningHours",
-            "places.photos",
-            "places.types"
-        ])
-        
-        headers = {
-            **self.headers,
-            "X-Goog-FieldMask": field_mask
-        }
-        
-        response = requests.post(url, json=request_body, headers=headers, timeout=10)
+        response = await self._request(
+            "POST", self.SEARCH_URL, content=orjson.dumps(request_body),
+            headers=self._search_headers, timeout=10
+        )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         places = data.get('places', [])
         
-        # Debug logging to check for photos
-        if places:
-            has_photos = sum(1 for p in places if 'photos' in p)
-            logger.info(f"DEBUG_PHOTOS: Found {len(places)} places. {has_photos} have photos.")
-            if has_photos > 0:
-                first_with_photo = next(p for p in places if 'photos' in p)
-                logger.info(f"DEBUG_PHOTOS: Sample photo data: {first_with_photo.get('photos')[0]['name']}")
+        # Debug logging to check for photos, skipped unless DEBUG is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            if places:
+                has_photos = sum(1 for p in places if 'photos' in p)
+                logger.debug("DEBUG_PHOTOS: Found %d places. %d have photos.", len(places), has_photos)
+                if has_photos > 0:
+                    first_with_photo = next(p for p in places if 'photos' in p)
+                    logger.debug("DEBUG_PHOTOS: Sample photo data: %s", first_with_photo['photos'][0].get('name'))
+                else:
+                    logger.debug("DEBUG_PHOTOS: No photos found in any results for this search.")
             else:
-                 logger.info("DEBUG_PHOTOS: No photos found in any results for this search.")
-        else:
-            logger.info("DEBUG_PHOTOS: No places found in API response")
-            
+                logger.debug("DEBUG_PHOTOS: No places found in API response")
+        
+        with _cache_lock:
+            _search_cache[cache_key] = places
         return places
     
-    def get_place_details(self, place_id: str) -> Dict:
+    async def get_place_details(self, place_id: str, detail_level: str = "full") -> Dict:
         """
         Get detailed information about a specific place.
         
@@ -235,12 +522,14 @@ class GooglePlacesService:
         
         Args:
             place_id: Google Places ID (may include 'places/' prefix)
+            detail_level: "full" for summary fields including reviews,
+                "minimal" for location and address only
             
         Returns:
             Dict: Detailed place information
             
         Raises:
-            requests.HTTPError: If the API request fails
+            httpx.HTTPStatusError: If the API request fails
         """
         # Ensure place_id is in correct format
         if not place_id.startswith('places/'):
@@ -248,33 +537,41 @@ class GooglePlacesService:
         
         url = f"{self.BASE_URL}/{place_id}"
         
-        # Specify fields to return
-        field_mask = ",".join([
-            "id",
-            "displayName",
-            "formattedAddress",
-            "location",
-            "rating",
-            "userRatingCount",
-            "priceLevel",
-            "websiteUri",
-            "nationalPhoneNumber",
-            "internationalPhoneNumber",
-            "currentOpeningHours",
-            "regularOpeningHours",
-            "types",
-            "editorialSummary",
-            "reviews"
-        ])
-        
-        headers = {
-            **self.headers,
-            "X-Goog-FieldMask": field_mask
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
+        response = await self._request(
+            "GET", url, headers=self._details_headers[detail_level], timeout=10
+        )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
+    
+    async def get_place_details_batch(
+        self,
+        place_ids: List[str],
+        detail_level: str = "full"
+    ) -> List[Dict]:
+        """
+        Get details for several places concurrently.
+        
+        The Places API has no batch endpoint, so requests are issued in
+        parallel, capped at PLACES_DETAILS_CONCURRENCY in flight.
+        
+        Args:
+            place_ids: Google Places IDs (may include 'places/' prefix)
+            detail_level: Field set to request, as in get_place_details
+            
+        Returns:
+            List: One entry per place ID, in order - the place details, or
+                the exception raised while fetching them
+        """
+        semaphore = asyncio.Semaphore(settings.PLACES_DETAILS_CONCURRENCY)
+        
+        async def fetch_one(place_id: str) -> Dict:
+            async with semaphore:
+                return await self.get_place_details(place_id, detail_level)
+        
+        return await asyncio.gather(
+            *(fetch_one(place_id) for place_id in place_ids),
+            return_exceptions=True
+        )
     
     def calculate_distance(
         self,
@@ -301,121 +598,219 @@ class GooglePlacesService:
         # Earth's radius in miles
         EARTH_RADIUS_MILES = 3959.0
         
-        # Convert degrees to radians
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
+        # Haversine formula, with degrees converted by multiplication and the
+        # half-angle folded into the same scaling
+        sin_dlat = math.sin((lat2 - lat1) * _DEG2RAD * 0.5)
+        sin_dlon = math.sin((lon2 - lon1) * _DEG2RAD * 0.5)
         
-        # Haversine formula
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-        
-        a = (math.sin(dlat / 2) ** 2 + 
-             math.cos(lat1_rad) * math.cos(lat2_rad) * 
-             math.sin(dlon / 2) ** 2)
-        c = 2 * math.asin(math.sqrt(a))
+        a = (sin_dlat * sin_dlat +
+             math.cos(lat1 * _DEG2RAD) * math.cos(lat2 * _DEG2RAD) *
+             sin_dlon * sin_dlon)
+        c = 2.0 * math.asin(math.sqrt(a))
         
         distance = EARTH_RADIUS_MILES * c
         return round(distance, 2)
     
+    def calculate_distances_batch(
+        self,
+        user_lat: float,
+        user_lon: float,
+        lats: np.ndarray,
+        lons: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate great-circle distances from one point to many points.
+        
+        Vectorized Haversine formula, equivalent to calling
+        calculate_distance once per point.
+        
+        Args:
+            user_lat: Latitude of the origin point
+            user_lon: Longitude of the origin point
+            lats: Latitudes of the destination points
+            lons: Longitudes of the destination points
+            
+        Returns:
+            np.ndarray: Distances in miles, rounded to 2 decimal places
+        """
+        # Earth's radius in miles
+        EARTH_RADIUS_MILES = 3959.0
+        
+        lat1_rad = math.radians(user_lat)
+        lat2_rad = np.radians(lats)
+        dlat = lat2_rad - lat1_rad
+        dlon = np.radians(lons) - math.radians(user_lon)
+        
+        a = (np.sin(dlat / 2) ** 2 +
+             math.cos(lat1_rad) * np.cos(lat2_rad) *
+             np.sin(dlon / 2) ** 2)
+        c = 2 * np.arcsin(np.sqrt(a))
+        
+        return np.round(EARTH_RADIUS_MILES * c, 2)
+    
+    def convert_places_to_models(
+        self,
+        places: List[Dict],
+        user_lat: float,
+        user_lon: float
+    ) -> List[Restaurant]:
+        """
+        Convert a list of Google Places API responses to Restaurant models.
+        
+        Computes all distances in one vectorized pass instead of one
+        Haversine call per place.
+        
+        Args:
+            places: Raw place dictionaries from Google Places API
+            user_lat: User's latitude for distance calculation
+            user_lon: User's longitude for distance calculation
+            
+        Returns:
+            List[Restaurant]: Populated restaurant models, in input order
+        """
+        count = len(places)
+        lats = np.fromiter(
+            (p.get('location', {}).get('latitude', 0) for p in places),
+            dtype=np.float64,
+            count=count
+        )
+        lons = np.fromiter(
+            (p.get('location', {}).get('longitude', 0) for p in places),
+            dtype=np.float64,
+            count=count
+        )
+        distances = self.calculate_distances_batch(user_lat, user_lon, lats, lons)
+        
+        return [
+            self.convert_to_restaurant_model(place, user_lat, user_lon, distance=distance)
+            for place, distance in zip(places, distances.tolist())
+        ]
+    
     def convert_to_restaurant_model(
         self,
         place: Dict,
         user_lat: float,
-        user_lon: float
+        user_lon: float,
+        distance: Optional[float] = None
     ) -> Restaurant:
         """
         Convert Google Places API response to Restaurant model.
         
         Transforms the raw API response dictionary into a structured
         Restaurant model object with all necessary fields populated.
+        Place fields come from a cached template, so repeat conversions of
+        the same place only compute the distance.
         
         Args:
             place: Raw place dictionary from Google Places API
             user_lat: User's latitude for distance calculation
             user_lon: User's longitude for distance calculation
+            distance: Precomputed distance in miles (computed if omitted)
             
         Returns:
             Restaurant: Populated restaurant model instance
         """
-        # Extract location
-        location = place.get('location', {})
-        place_lat = location.get('latitude', 0)
-        place_lng = location.get('longitude', 0)
+        template = _restaurant_template(place)
         
         # Calculate distance
-        distance = self.calculate_distance(user_lat, user_lon, place_lat, place_lng)
-        
-        # Extract display name
-        display_name = place.get('displayName', {})
-        name = display_name.get('text', 'Unknown') if isinstance(display_name, dict) else str(display_name)
-        
-        # Determine cuisine types
-        cuisine = ['Pizza']
-        types = place.get('types', [])
-        
-        if 'italian_restaurant' in types:
-            cuisine.append('Italian')
-        if 'vegan_restaurant' in types:
-            cuisine.append('Vegan')
-        if 'vegetarian_restaurant' in types:
-            cuisine.append('Vegetarian')
-        
-        # Get opening hours
-        open_now = None
-        current_hours = place.get('currentOpeningHours', {})
-        if current_hours:
-            open_now = current_hours.get('openNow')
-        
-        # Extract price level (convert from text to number)
-        price_level = 2  # default
-        price_level_text = place.get('priceLevel')
-        if price_level_text:
-            price_map = {
-                'PRICE_LEVEL_FREE': 1,
-                'PRICE_LEVEL_INEXPENSIVE': 1,
-                'PRICE_LEVEL_MODERATE': 2,
-                'PRICE_LEVEL_EXPENSIVE': 3,
-                'PRICE_LEVEL_VERY_EXPENSIVE': 4
-            }
-            price_level = price_map.get(price_level_text, 2)
+        if distance is None:
+            distance = self.calculate_distance(
+                user_lat, user_lon, template.latitude, template.longitude
+            )
         
-        # Extract phone number
-        phone = place.get('nationalPhoneNumber') or place.get('internationalPhoneNumber')
+        return template.model_copy(update={'distance': distance})
+
+
+def _parse_place_static(place: Dict) -> Dict:
+    """
+    Extract the Restaurant fields of a place that do not depend on the user.
+    
+    Args:
+        place: Raw place dictionary from Google Places API
         
-        # Extract website
-        website = place.get('websiteUri')
+    Returns:
+        Dict: Restaurant keyword arguments for every field except distance
+    """
+    # Extract location
+    location = place.get('location', {})
+    
+    # Extract display name
+    display_name = place.get('displayName', {})
+    name = display_name.get('text', 'Unknown') if isinstance(display_name, dict) else str(display_name)
+    
+    # Determine cuisine types
+    types = place.get('types', [])
+    cuisine = PIZZA_CUISINE + tuple(
+        label for place_type, label in _CUISINE_TYPE_MAP.items() if place_type in types
+    )
+    
+    # Get opening hours
+    open_now = None
+    current_hours = place.get('currentOpeningHours', {})
+    if current_hours:
+        open_now = current_hours.get('openNow')
+    
+    # Extract price level (convert from text to number)
+    price_level = 2  # default
+    price_level_text = place.get('priceLevel')
+    if price_level_text:
+        price_level = _PRICE_LEVEL_MAP.get(price_level_text, 2)
+    
+    # Get the place ID (remove 'places/' prefix if present)
+    place_id = place.get('id', place.get('name', ''))
+    if place_id.startswith('places/'):
+        place_id = place_id[7:]  # Remove 'places/' prefix
+    
+    # Extract photo URL if available
+    photo_url = None
+    first_photo = next(iter(place.get('photos') or ()), None)
+    photo_name = first_photo.get('name') if first_photo else None
+    if photo_name:
+        # Use our proxy endpoint to avoid exposing API key
+        photo_url = f"{settings.BASE_URL}/api/media/{photo_name}"
+    
+    return {
+        'id': place_id,
+        'name': name,
+        'address': place.get('formattedAddress', 'N/A'),
+        'rating': place.get('rating', 0.0),
+        'priceLevel': price_level,
+        'cuisine': cuisine,
+        'phone': place.get('nationalPhoneNumber') or place.get('internationalPhoneNumber'),
+        'website': place.get('websiteUri'),
+        'openNow': open_now,
+        'latitude': location.get('latitude', 0),
+        'longitude': location.get('longitude', 0),
+        'photoUrl': photo_url
+    }
+
+
+def _restaurant_template(place: Dict) -> Restaurant:
+    """
+    Get the validated Restaurant for a place, with distance left at 0.
+    
+    Templates are cached per place ID together with the place dict they were
+    built from. Search cache hits return the same dict objects, so the
+    template is reused exactly while that search response is cached and
+    rebuilt as soon as fresh data arrives.
+    
+    Args:
+        place: Raw place dictionary from Google Places API
         
-        # Get the place ID (remove 'places/' prefix if present)
-        place_id = place.get('id', place.get('name', ''))
-        if place_id.startswith('places/'):
-            place_id = place_id[7:]  # Remove 'places/' prefix
-            
-        # Extract photo URL if available
-        photo_url = None
-        photos = place.get('photos', [])
-        if photos and len(photos) > 0:
-            photo_name = photos[0].get('name')
-            if photo_name:
-                # Use our proxy endpoint to avoid exposing API key
-                photo_url = f"{settings.BASE_URL}/api/media/{photo_name}"
-
-        return Restaurant(
-            id=place_id,
-            name=name,
-            address=place.get('formattedAddress', 'N/A'),
-            distance=distance,
-            rating=place.get('rating', 0.0),
-            priceLevel=price_level,
-            cuisine=cuisine,
-            phone=phone,
-            website=website,
-            openNow=open_now,
-            latitude=place_lat,
-            longitude=place_lng,
-            photoUrl=photo_url
-        )
+    Returns:
+        Restaurant: Restaurant model with every field except distance set
+    """
+    cache_key = place.get('id') or place.get('name')
+    with _cache_lock:
+        cached = _template_cache.get(cache_key)
+    if cached is not None and cached[0] is place:
+        return cached[1]
+    
+    template = Restaurant(**_parse_place_static(place), distance=0.0)
+    if cache_key:
+        with _cache_lock:
+            _template_cache[cache_key] = (place, template)
+    return template
 
 
 # Singleton instance
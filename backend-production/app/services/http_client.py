@@ -0,0 +1,52 @@
+"""
+Shared HTTP client module.
+
+This module owns the process-wide httpx.AsyncClient used for outbound
+requests to Google APIs, so connections are pooled and reused instead of
+paying a TCP+TLS handshake on every call.
+"""
+
+import httpx
+from typing import Optional
+
+# Singleton client - opened in the app lifespan, created lazily otherwise
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def init_http_client() -> httpx.AsyncClient:
+    """
+    Create the shared AsyncClient if it does not exist yet.
+
+    Returns:
+        httpx.AsyncClient: The shared HTTP/2 client with connection pooling
+            and retries on connection failures
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        # retries only covers failed connection attempts (DNS, refused, reset
+        # during connect), which are always safe to retry
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            retries=3
+        )
+        _http_client = httpx.AsyncClient(transport=transport, timeout=10.0)
+    return _http_client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared AsyncClient, creating it on first use.
+
+    Returns:
+        httpx.AsyncClient: The shared client instance
+    """
+    return init_http_client()
+
+
+async def close_http_client() -> None:
+    """Close the shared AsyncClient and release pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
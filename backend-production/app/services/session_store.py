@@ -0,0 +1,172 @@
+"""
+Session store module.
+
+This module stores each search session's ranked restaurants. When REDIS_URL
+is configured, sessions live in Redis so every worker process shares them
+and they survive restarts; otherwise a bounded in-process TTL cache is used.
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import msgpack
+import redis.asyncio as redis
+from cachetools import TTLCache
+
+from app.config import settings
+from app.models import Restaurant
+
+logger = logging.getLogger(__name__)
+
+
+def build_windows(restaurants: List[Restaurant]) -> Tuple[Tuple[Restaurant, ...], ...]:
+    """
+    Precompute the page of recommendations returned for every offset.
+
+    Window i holds MAX_RECOMMENDATIONS restaurants starting at index i,
+    wrapping around to the start of the list when it runs out.
+
+    Args:
+        restaurants: Ranked restaurants for a session
+
+    Returns:
+        Tuple of windows, one per starting offset
+    """
+    size = settings.MAX_RECOMMENDATIONS
+    doubled = restaurants * 2
+    return tuple(tuple(doubled[i:i + size]) for i in range(len(restaurants)))
+
+
+class SessionStore:
+    """
+    In-process session store backed by a TTL cache.
+
+    Entries have the form {"windows": tuple, "search_key": tuple}, where
+    windows comes from build_windows.
+    Reading an entry resets its TTL, so sessions expire after inactivity.
+    """
+
+    backend = "memory"
+
+    def __init__(self):
+        self._cache: TTLCache = TTLCache(
+            maxsize=settings.SESSION_CACHE_MAX_SIZE,
+            ttl=settings.SESSION_CACHE_TTL_SECONDS
+        )
+        self._lock = threading.Lock()
+
+    async def get(self, session_id: str) -> Optional[Dict]:
+        """
+        Get a session entry and refresh its TTL.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            Optional[Dict]: The session entry, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is not None:
+                # Re-insert so the TTL is measured from the last access
+                self._cache[session_id] = entry
+            return entry
+
+    async def set(self, session_id: str, entry: Dict) -> None:
+        """
+        Store a session entry.
+
+        Args:
+            session_id: The session identifier
+            entry: Session data with "windows" and "search_key"
+        """
+        with self._lock:
+            self._cache[session_id] = entry
+
+    async def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Session store shared across worker processes via Redis.
+
+    Only the ranked restaurants are msgpack-encoded and stored under
+    "sess:{session_id}" with a sliding expiry; windows are rebuilt on read,
+    with restaurants restored via model_construct since the data was
+    validated before it was written.
+    
+    Redis is only a cache: if it is slow or unreachable, reads count as
+    misses and writes are skipped, so recommendations are still served.
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: str):
+        self._redis = redis.Redis.from_url(
+            url,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS
+        )
+        self._ttl = settings.SESSION_CACHE_TTL_SECONDS
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"sess:{session_id}"
+
+    async def get(self, session_id: str) -> Optional[Dict]:
+        # Fetch and refresh the expiry in a single round trip
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._key(session_id))
+                pipe.expire(self._key(session_id), self._ttl)
+                value, _ = await pipe.execute()
+        except (redis.RedisError, TimeoutError) as e:
+            logger.warning(f"Session store read failed, treating as a miss: {e!r}")
+            return None
+
+        if value is None:
+            return None
+
+        # Decode arrays as tuples: the search key is compared against a fresh
+        # tuple and Restaurant.cuisine is a tuple
+        search_key, restaurants = msgpack.unpackb(value, use_list=False)
+        return {
+            "windows": build_windows([Restaurant.model_construct(**r) for r in restaurants]),
+            "search_key": search_key
+        }
+
+    async def set(self, session_id: str, entry: Dict) -> None:
+        value = msgpack.packb([
+            entry["search_key"],
+            # The first restaurant of each window is the ranked list itself
+            [window[0].model_dump() for window in entry["windows"]]
+        ])
+        try:
+            await self._redis.set(self._key(session_id), value, ex=self._ttl)
+        except (redis.RedisError, TimeoutError) as e:
+            logger.warning(f"Session store write failed, skipping: {e!r}")
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+# Singleton instance
+_session_store_instance: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    """
+    Get or create the SessionStore singleton instance.
+
+    Returns:
+        SessionStore: Redis-backed if REDIS_URL is set, in-process otherwise
+    """
+    global _session_store_instance
+    if _session_store_instance is None:
+        if settings.REDIS_URL:
+            _session_store_instance = RedisSessionStore(settings.REDIS_URL)
+        else:
+            _session_store_instance = SessionStore()
+    return _session_store_instance